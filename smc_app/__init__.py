@@ -0,0 +1,9 @@
+"""SMC Trading Bot dashboard package.
+
+All dashboard logic lives in smc_app.core; the top-level app.py is a
+thin shim so Streamlit Cloud keeps its existing entry point.
+"""
+
+from smc_app.core import main
+
+__all__ = ['main']
@@ -0,0 +1,567 @@
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import streamlit as st
+import pandas as pd
+import yfinance as yf
+import plotly.graph_objects as go
+import requests
+import numpy as np # Used by Numba/llvmlite dependencies
+
+try:
+    from numba import njit, prange
+    _HAS_NUMBA = True
+except ImportError:  # Numba ships with smartmoneyconcepts, but don't crash without it
+    _HAS_NUMBA = False
+    prange = range
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        def wrap(func):
+            return func
+        return wrap
+
+
+# --- 2. DISCORD NOTIFICATION FUNCTION ---
+@st.cache_resource
+def _alert_executor():
+    """Small worker pool so alert delivery never blocks a rerun."""
+    return ThreadPoolExecutor(max_workers=2)
+
+
+def _do_send(session, url, payload, status):
+    """Posts the alert off the main thread and records the outcome."""
+    try:
+        response = session.post(url, json=payload, timeout=10)
+
+        if response.status_code == 204:
+            status['ok'] = True
+            status['detail'] = "✅ Discord Alert Sent Successfully!"
+        else:
+            status['ok'] = False
+            status['detail'] = f"❌ Failed to send Discord alert. Status code: {response.status_code}. Please check the Webhook URL."
+
+    except Exception as e:
+        status['ok'] = False
+        status['detail'] = f"❌ An unexpected error occurred in Discord function: {e}"
+
+
+def send_discord_alert(alert_message):
+    """Queues an alert message to a configured Discord Webhook.
+
+    The POST runs in a background thread over the shared session, so the
+    click is instantly responsive; the delivery status is written into
+    st.session_state and shown on the next rerun.
+    """
+    # Robustly retrieve the secret (prevents crashing if not found —
+    # st.secrets.get raises when no secrets file exists at all)
+    try:
+        WEBHOOK_URL = st.secrets.get("DISCORD_WEBHOOK_URL")
+    except Exception as e:
+        st.error(f"❌ An unexpected error occurred in Discord function: {e}")
+        return
+
+    if not WEBHOOK_URL:
+        st.error("🚨 Error: The 'DISCORD_WEBHOOK_URL' secret is not configured in Streamlit Cloud. Cannot send alert.")
+        return
+
+    payload = {
+        "content": alert_message,
+        "username": "SMC Trading Bot"
+    }
+
+    status = st.session_state.setdefault('last_alert_status', {})
+    status.clear()
+    _alert_executor().submit(_do_send, _http_session(), WEBHOOK_URL, payload, status)
+    st.info("📤 Alert queued — delivery status appears on the next refresh.")
+
+
+# --- 3. DATA FETCHING AND PREPARATION ---
+# Approximate bar counts used to shrink the download to what the chart needs.
+_BARS_PER_DAY = {'1h': 24, '4h': 6, '1d': 1}
+_PERIOD_DAYS = {'1mo': 30, '3mo': 90, '6mo': 180, '1y': 365}
+_INTERVAL_MS = {'1h': 3_600_000, '4h': 14_400_000, '1d': 86_400_000}
+
+
+class FileCache:
+    """JSON-on-disk OHLCV cache so repeated fetches survive container restarts.
+
+    Entries are keyed by (ticker, period, interval) and stamped with the
+    current candle bucket, so every rerun within the same bar shares one
+    download while a new bar invalidates the entry.
+    """
+
+    def __init__(self, root=os.path.join('.cache', 'ohlcv')):
+        self.root = root
+
+    def _path(self, ticker, period, interval):
+        return os.path.join(self.root, ticker.replace('/', '_'), f"{period}_{interval}.json")
+
+    def load(self, ticker, period, interval, bucket):
+        try:
+            with open(self._path(ticker, period, interval)) as f:
+                payload = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if payload.get('bucket') != bucket:
+            return None
+        # View the stored epoch-ms integers as datetimes directly — no
+        # per-element pd.to_datetime parse, no intermediate object column.
+        stamps = np.asarray(payload['index'], np.int64).view('datetime64[ms]')
+        index = pd.DatetimeIndex(stamps)
+        if payload.get('tz'):
+            index = index.tz_localize('UTC').tz_convert(payload['tz'])
+        return pd.DataFrame(np.asarray(payload['data'], np.float64),
+                            columns=payload['columns'],
+                            index=index)
+
+    def store(self, ticker, period, interval, bucket, df):
+        path = self._path(ticker, period, interval)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        payload = {
+            'bucket': bucket,
+            # as_unit('ms') works for any index resolution — asi8 alone
+            # would be epoch-seconds on a second-resolution index.
+            'index': df.index.as_unit('ms').asi8.tolist(),
+            'tz': str(df.index.tz) if df.index.tz is not None else None,
+            'columns': list(df.columns),
+            'data': df.to_numpy(np.float64).tolist(),
+        }
+        with open(path, 'w') as f:
+            json.dump(payload, f)
+
+
+_FILE_CACHE = FileCache()
+
+
+@st.cache_resource
+def _http_session():
+    """Shared HTTP session, created once and reused across reruns.
+
+    Keeping one live session means pooled TCP/TLS connections instead of
+    a fresh handshake per download; a read-only session is safe to share.
+    """
+    return requests.Session()
+
+
+def choose_period(period, interval, lookback):
+    """Shrinks the requested period to the smallest one covering the chart lookback.
+
+    There is no point downloading a year of candles to draw 100 bars; a
+    smaller request means fewer bytes on the wire and less JSON to parse
+    on every rerun. A +50 bar margin keeps the SMC analysis well fed.
+    """
+    needed_days = (lookback + 50) / _BARS_PER_DAY.get(interval, 1)
+    for candidate, days in _PERIOD_DAYS.items():
+        if days >= needed_days:
+            if days < _PERIOD_DAYS.get(period, days):
+                return candidate
+            break
+    return period
+
+
+@st.cache_data(ttl=600)
+def fetch_data(ticker, period, interval):
+    """Fetches OHLCV data and prepares it with lowercase columns for SMC analysis."""
+    # Quantize the cache key to the candle boundary so intrabar reruns
+    # share one entry regardless of when exactly they happen.
+    bucket = int(time.time() * 1000) // _INTERVAL_MS.get(interval, 86_400_000)
+    cached = _FILE_CACHE.load(ticker, period, interval, bucket)
+    if cached is not None:
+        return cached
+
+    st.info(f"Fetching {ticker} data...")
+    try:
+        # auto_adjust folds the adjustment into 'Close' so there is no
+        # 'Adj Close' column to rename away; threads parallelizes any
+        # future multi-ticker download.
+        data = yf.download(ticker, period=period, interval=interval,
+                           auto_adjust=True, threads=True, progress=False,
+                           session=_http_session())
+        if data.empty:
+            return pd.DataFrame()
+
+        # CRITICAL SMC FIX: Rename columns to lowercase
+        data.columns = data.columns.str.lower()
+        if any(col not in data.columns for col in ('open', 'high', 'low', 'close')):
+            return pd.DataFrame()
+
+        _FILE_CACHE.store(ticker, period, interval, bucket, data)
+        return data
+
+    except Exception as e:
+        st.error(f"Failed to fetch data: {e}")
+        return pd.DataFrame()
+
+# --- 4. ORDER BLOCK DETECTION ---
+def _f4(series):
+    """Extracts a Series as a writable float32 array for the jitted kernels.
+
+    Under pandas copy-on-write, to_numpy on a column that is already
+    float32 returns a read-only view, which the eager f4[:] signatures
+    reject; the copy only happens in that case, never on conversion.
+    """
+    arr = series.to_numpy(np.float32)
+    if not arr.flags.writeable:
+        arr = arr.copy()
+    return arr
+
+
+
+# The explicit signature forces compilation at import time, so the first
+# Streamlit run warms the on-disk cache and reruns skip the JIT stall.
+@njit('Tuple((i4[:], f4[:], f4[:]))(b1[:], b1[:], f4[:], f4[:], i8)', cache=True)
+def _ob_loop(up, down, l, h, lookback):
+    """Compiled scan for bullish order blocks over precomputed move arrays."""
+    n = down.shape[0]
+    idx = np.empty(n, np.int32)
+    lo = np.empty(n, np.float32)
+    hi = np.empty(n, np.float32)
+    k = 0
+    for i in range(1, n - lookback):
+        if down[i]:
+            all_up = True
+            for j in range(i + 1, i + 1 + lookback):
+                if not up[j]:
+                    all_up = False
+                    break
+            if all_up:
+                idx[k] = i
+                lo[k] = l[i]
+                hi[k] = h[i]
+                k += 1
+    return idx[:k], lo[:k], hi[:k]
+
+
+def _ob_loop_numpy(up, down, l, h, lookback):
+    """Vectorized fallback for _ob_loop when Numba is unavailable.
+
+    Builds the "all of the next `lookback` closes are up-moves" condition
+    with `lookback` contiguous boolean ANDs instead of a Python inner loop.
+    """
+    n = down.shape[0]
+    if n <= lookback + 1:
+        # Mirror the jitted kernel, whose scan range is empty here; the
+        # sliced ANDs below would wrap negative lengths and misbroadcast.
+        idx = np.empty(0, np.int64)
+        return idx, l[idx], h[idx]
+    window_all = np.zeros(n, bool)
+    window_all[1:n - lookback] = True
+    for j in range(lookback):
+        window_all[:n - 1 - j] &= up[j + 1:]
+    idx = np.flatnonzero(window_all & down)
+    return idx, l[idx], h[idx]
+
+
+@njit('Tuple((f4[:, :], f4[:, :], i8[:]))(b1[:, :], b1[:, :], f4[:, :], f4[:, :], i8)',
+      cache=True, parallel=True)
+def _ob_loop_batch(up, down, l, h, lookback):
+    """Parallel order block scan over a stacked (symbols, bars) batch.
+
+    Each symbol row is independent, so prange spreads them across cores;
+    the kernel drops the GIL while it runs.
+    """
+    n_symbols, n = down.shape
+    lo = np.empty((n_symbols, n), np.float32)
+    hi = np.empty((n_symbols, n), np.float32)
+    counts = np.zeros(n_symbols, np.int64)
+    for s in prange(n_symbols):
+        k = 0
+        for i in range(1, n - lookback):
+            if down[s, i]:
+                all_up = True
+                for j in range(i + 1, i + 1 + lookback):
+                    if not up[s, j]:
+                        all_up = False
+                        break
+                if all_up:
+                    lo[s, k] = l[s, i]
+                    hi[s, k] = h[s, i]
+                    k += 1
+        counts[s] = k
+    return lo, hi, counts
+
+
+def find_order_blocks(df, lookback=3):
+    """Finds bullish order blocks: a down candle followed by `lookback` consecutive up-closes.
+
+    Returns a structure-of-arrays dict ({'time', 'low', 'high', 'kind'})
+    instead of a DataFrame — four NumPy arrays rather than N boxed rows,
+    read directly by the chart code.
+    """
+    if df.empty:
+        return {'time': np.empty(0, 'datetime64[ns]'),
+                'low': np.empty(0, np.float32),
+                'high': np.empty(0, np.float32),
+                'kind': np.empty(0, np.int8)}
+
+    o = _f4(df['open'])
+    h = _f4(df['high'])
+    l = _f4(df['low'])
+    c = _f4(df['close'])
+
+    # Keep the move flags as local arrays — writing them to df as columns
+    # would copy pandas blocks and mutate the cached frame from fetch_data.
+    up = np.empty(len(c), bool)
+    up[0] = False
+    up[1:] = c[1:] > c[:-1]
+    down = c < o
+
+    ob_loop = _ob_loop if _HAS_NUMBA else _ob_loop_numpy
+    idx, lo, hi = ob_loop(up, down, l, h, lookback)
+    return {'time': df.index.to_numpy()[idx], 'low': lo, 'high': hi,
+            'kind': np.ones(len(idx), np.int8)}
+
+
+def scan_watchlist(symbols, period, interval, lookback=3):
+    """Runs order block detection across a whole watchlist.
+
+    The downloads run concurrently (requests releases the GIL on I/O),
+    the frames are stacked into one (symbols, bars) batch truncated to
+    the shortest history, and a single parallel kernel call scans them.
+    """
+    with ThreadPoolExecutor(max_workers=min(len(symbols), 8)) as pool:
+        frames = list(pool.map(lambda s: fetch_data(s, period, interval), symbols))
+
+    loaded = [(sym, f) for sym, f in zip(symbols, frames) if not f.empty]
+    if not loaded:
+        return pd.DataFrame()
+
+    n = min(len(f) for _, f in loaded)
+    n_symbols = len(loaded)
+    up = np.zeros((n_symbols, n), bool)
+    down = np.zeros((n_symbols, n), bool)
+    lows = np.empty((n_symbols, n), np.float32)
+    highs = np.empty((n_symbols, n), np.float32)
+    for i, (_, f) in enumerate(loaded):
+        o = _f4(f['open'])[-n:]
+        c = _f4(f['close'])[-n:]
+        up[i, 1:] = c[1:] > c[:-1]
+        down[i] = c < o
+        lows[i] = _f4(f['low'])[-n:]
+        highs[i] = _f4(f['high'])[-n:]
+
+    if _HAS_NUMBA:
+        lo, hi, counts = _ob_loop_batch(up, down, lows, highs, lookback)
+    else:
+        lo = np.zeros((n_symbols, n), np.float32)
+        hi = np.zeros((n_symbols, n), np.float32)
+        counts = np.zeros(n_symbols, np.int64)
+        for i in range(n_symbols):
+            _, lo_i, hi_i = _ob_loop_numpy(up[i], down[i], lows[i], highs[i], lookback)
+            counts[i] = len(lo_i)
+            lo[i, :len(lo_i)] = lo_i
+            hi[i, :len(hi_i)] = hi_i
+
+    rows = []
+    for i, (sym, _) in enumerate(loaded):
+        k = int(counts[i])
+        rows.append({
+            'symbol': sym,
+            'order_blocks': k,
+            'latest_ob_low': lo[i, k - 1] if k else np.nan,
+            'latest_ob_high': hi[i, k - 1] if k else np.nan,
+        })
+    return pd.DataFrame(rows)
+
+
+# --- 5. SMC ANALYSIS ---
+@njit('i1[:](f4[:], f4[:], f8, f8)', cache=True)
+def _zigzag(h, l, up_thresh, down_thresh):
+    """Single-pass ZigZag over high/low arrays.
+
+    Tracks the running extreme and emits a pivot (1 = swing high,
+    -1 = swing low) once price retraces past the percentage threshold.
+    """
+    n = h.shape[0]
+    out = np.zeros(n, np.int8)
+    if n == 0:
+        return out
+    last_price = h[0]
+    last_idx = 0
+    direction = 1  # 1 while tracking a high, -1 while tracking a low
+    for i in range(1, n):
+        if direction == 1:
+            if h[i] > last_price:
+                last_price = h[i]
+                last_idx = i
+            elif (l[i] - last_price) / last_price <= down_thresh:
+                out[last_idx] = 1
+                last_price = l[i]
+                last_idx = i
+                direction = -1
+        else:
+            if l[i] < last_price:
+                last_price = l[i]
+                last_idx = i
+            elif (h[i] - last_price) / last_price >= up_thresh:
+                out[last_idx] = -1
+                last_price = h[i]
+                last_idx = i
+                direction = 1
+    return out
+
+
+@st.cache_resource
+def _smc():
+    """Imports smartmoneyconcepts on first use only.
+
+    The library drags in the whole Numba/llvmlite chain, so importing it
+    at module top taxed every cold start even when no analysis ran.
+    """
+    from smartmoneyconcepts import smc
+    return smc
+
+
+def run_smc_analysis(df):
+    """Runs Smart Money Concepts analysis."""
+    if df.empty:
+        return df
+
+    try:
+        smc = _smc()
+
+        # Detect Swing Highs and Lows with the local compiled ZigZag
+        df['highslows'] = _zigzag(_f4(df['high']),
+                                  _f4(df['low']),
+                                  0.05, -0.05)
+        
+        # Detect Order Blocks
+        if 'highslows' in df.columns:
+            df = smc.ob(df, swing_highs_lows=df['highslows'])
+        
+        # Detect Fair Value Gaps
+        df = smc.fvg(df)
+        
+    except Exception as e:
+        st.warning(f"SMC Analysis failed (library error): {e}. Showing raw data.")
+
+    return df
+
+
+# --- 6. CHARTING ---
+@st.cache_resource
+def _fig_skeleton():
+    """Static figure shell, built once and reused across reruns.
+
+    Only the traces, title and shapes change per rerun, so the layout
+    template doesn't need to be reconstructed and re-validated each time.
+    """
+    fig = go.Figure()
+    fig.update_layout(
+        xaxis_title="Date",
+        yaxis_title="Price (USD)",
+        xaxis_rangeslider_visible=False,
+        height=700
+    )
+    return fig
+
+
+# --- MAIN APP LOGIC ---
+def main():
+    """Entry point for the Streamlit dashboard (run via the top-level app.py shim)."""
+    # --- 1. CONFIGURATION ---
+    st.set_page_config(
+        page_title="SMC Trading Bot Dashboard",
+        layout="wide",
+        initial_sidebar_state="expanded"
+    )
+
+    st.sidebar.header("Market Settings")
+    symbol = st.sidebar.text_input("Symbol", value="BTC-USD")
+    interval = st.sidebar.selectbox("Interval", options=["1h", "4h", "1d"], index=1)
+    period = st.sidebar.selectbox("Data Period", options=["1mo", "3mo", "6mo", "1y"], index=0)
+    lookback = st.sidebar.slider("Chart Lookback (Bars)", min_value=10, max_value=200, value=100)
+    watchlist = st.sidebar.text_input("Watchlist (comma-separated, optional)", value="")
+
+    st.title(f"📈 SMC Trading Bot Dashboard for {symbol.upper()}")
+
+    data_raw = fetch_data(symbol, choose_period(period, interval, lookback), interval)
+
+    if not data_raw.empty:
+        df_analyzed = run_smc_analysis(data_raw)
+        
+        # 6. PLOT THE CHART
+        # Plotly only reads arrays, so slice NumPy views of the analyzed frame
+        # instead of materializing a df.iloc[-lookback:].copy() every rerun.
+        sl = slice(-lookback, None)
+        chart_index = df_analyzed.index[sl]
+        chart_open = df_analyzed['open'].to_numpy()[sl]
+        chart_high = df_analyzed['high'].to_numpy()[sl]
+        chart_low = df_analyzed['low'].to_numpy()[sl]
+        chart_close = df_analyzed['close'].to_numpy()[sl]
+
+        fig = _fig_skeleton()
+        fig.data = []
+        fig.add_trace(go.Candlestick(
+            x=chart_index,
+            open=chart_open,
+            high=chart_high,
+            low=chart_low,
+            close=chart_close,
+            name='Candlestick'
+        ))
+
+        fig.update_layout(title=f"{symbol.upper()} Price Action")
+
+        # Highlight detected order blocks on the chart. Building the full
+        # shapes list and assigning it once avoids re-validating the figure
+        # layout per rectangle the way repeated add_shape calls do.
+        obs = find_order_blocks(df_analyzed)
+        visible = obs['time'] >= chart_index.to_numpy()[0]
+        times = obs['time'][visible]
+        lows = obs['low'][visible]
+        highs = obs['high'][visible]
+        x1 = chart_index[-1]
+        shapes = [
+            dict(type='rect', x0=times[i], y0=lows[i], x1=x1, y1=highs[i],
+                 line=dict(color='green', width=1), fillcolor='green', opacity=0.2)
+            for i in range(len(times))
+        ]
+
+        # Zones flagged by the smartmoneyconcepts OB detector, if the
+        # analysis produced them — same batch build, colored by direction.
+        if 'OB' in df_analyzed.columns:
+            kinds = np.nan_to_num(df_analyzed['OB'].to_numpy(np.float64))
+            mask = (kinds != 0) & (df_analyzed.index.to_numpy() >= chart_index.to_numpy()[0])
+            ob_times = df_analyzed.index.to_numpy()[mask]
+            ob_lows = df_analyzed['low'].to_numpy()[mask]
+            ob_highs = df_analyzed['high'].to_numpy()[mask]
+            ob_colors = np.where(kinds[mask] == 1, 'green', 'red')
+            shapes += [
+                dict(type='rect', x0=ob_times[i], y0=ob_lows[i], x1=x1, y1=ob_highs[i],
+                     line=dict(color=ob_colors[i], width=1),
+                     fillcolor=ob_colors[i], opacity=0.3)
+                for i in range(len(ob_times))
+            ]
+
+        fig.update_layout(shapes=shapes)
+
+        st.plotly_chart(fig, use_container_width=True)
+
+        # 7. ALERT BUTTON
+        last_status = st.session_state.get('last_alert_status') or {}
+        if 'detail' in last_status:
+            (st.success if last_status.get('ok') else st.error)(last_status['detail'])
+
+        if st.button("🔔 Send Discord Alert (Example)"):
+            current_price = chart_close[-1]
+            alert_msg = f"SMC Bot Alert for {symbol.upper()}: Current price is {current_price:.2f}."
+            send_discord_alert(alert_msg)
+
+        st.subheader("Raw Analyzed Data (Last 5 Bars)")
+        st.dataframe(df_analyzed.tail().T) 
+    else:
+        st.warning("Could not load market data.")
+
+    # 8. WATCHLIST SCAN
+    if watchlist.strip():
+        watch_symbols = [s.strip().upper() for s in watchlist.split(',') if s.strip()]
+        st.subheader("Watchlist Order Block Scan")
+        scan_result = scan_watchlist(watch_symbols, period, interval)
+        if scan_result.empty:
+            st.warning("No watchlist data could be loaded.")
+        else:
+            st.dataframe(scan_result)